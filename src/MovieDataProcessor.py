@@ -1,16 +1,40 @@
-import os
+import asyncio
+import gzip
+import hashlib
+import json
+import shutil
+import sqlite3
+import subprocess
+import threading
+import numpy as np
 import pandas as pd
 import requests
 import tarfile
-import ast
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from itertools import chain
 import matplotlib.pyplot as plt
 from pathlib import Path
-import ollama
-from openai import OpenAI  
-import random
 from typing import Optional
+import ollama
+from openai import OpenAI
 from pydantic import BaseModel, field_validator
-from pydantic.functional_validators import field_validator
+
+# Python versions with extraction filters refuse absolute paths, links that leave the
+# target directory and device files, and don't restore ownership or permission bits
+TAR_FILTER = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True  # multi-threaded TSV parsing and the Parquet cache
+except ImportError:
+    HAS_PYARROW = False
+try:
+    from isal import igzip_threaded
+    from isal.isal_zlib import error as IsalError
+    HAS_ISAL = True  # multi-threaded ISA-L gzip decompression for extraction
+except ImportError:
+    HAS_ISAL = False
 
 class MovieInfo(BaseModel):
     title: str
@@ -28,102 +52,578 @@ class MovieInfo(BaseModel):
         if not v.strip():
             raise ValueError("Summary must be a non-empty string.")
         return v
+
+
+class GenreClassification(BaseModel):
+    """Genres the LLM gave one summary of a batch, with the number the summary was sent under."""
+    index: int
+    genres: str
+
+
+class GenreClassifications(BaseModel):
+    """Reply format of a batched genre classification: one item per numbered summary."""
+    classifications: list[GenreClassification]
+
+
 class MovieDataProcessor:
     """Class to handle the CMU Movie Corpus dataset."""
     
     DATA_URL = "http://www.cs.cmu.edu/~ark/personas/data/MovieSummaries.tar.gz"
     DOWNLOAD_DIR = Path("downloads/")
     FILE_NAME = DOWNLOAD_DIR / "MovieSummaries.tar.gz"
+    PARTIAL_FILE = DOWNLOAD_DIR / "MovieSummaries.tar.gz.partial"  # renamed to FILE_NAME once complete
     EXTRACTED_DIR = DOWNLOAD_DIR / "MovieSummaries"
+    EXTRACTED_MARKER = EXTRACTED_DIR / ".ok"  # written once extraction has finished
+    SUMMARY_CACHE = DOWNLOAD_DIR / "summaries.sqlite"
+    CHUNK_SIZE = 1024 * 1024
+    DOWNLOAD_WORKERS = 8
+    EXTRACT_THREADS = 4
+    REQUEST_TIMEOUT = 30  # seconds to wait for the server to connect or send data
+    HEIGHT_BINS = 20
+    LLM_MODEL = "mistral"
+    LLM_CONCURRENCY = 4  # summary requests in flight at once, so large batches don't flood Ollama
+    GENRE_CLASSIFIER_PROMPT = (
+        "You are a helpful assistant that classifies a movie plot into appropriate genres.\n"
+        "Read the following summary and output ONLY the genres that best describe it.\n"
+        "No explanations, no extra text. Just the genre(s)."
+    )
+    BATCH_GENRE_CLASSIFIER_PROMPT = (
+        "You are a helpful assistant that classifies movie plots into appropriate genres.\n"
+        "Read each of the numbered summaries and give ONLY the genres that best describe it.\n"
+        "Reply with a JSON object whose \"classifications\" list holds one item per summary, with the\n"
+        "summary's number as \"index\" and a comma-separated string of its genres as \"genres\".\n"
+        "No explanations, no extra text."
+    )
+    BATCH_CONTEXT_SIZE = 16384  # tokens of context for a batched classification, above Ollama's default
+    PLOT_PERSONALIZER_PROMPT = (
+        "You are a creative assistant that rewrites movie plots.\n"
+        "Rewrite the given movie plot to make the named person the main character.\n"
+        "Make appropriate adjustments to the storyline to naturally incorporate them as the protagonist,\n"
+        "while keeping the core plot elements, setting, and theme intact.\n"
+        "Please provide ONLY the rewritten plot, no explanations or other text."
+    )
+
+    # Attribute name -> (file name, column names, dtypes, columns to load or None for all)
+    # of each dataset in the corpus
+    DATASETS = {
+        "character_metadata": (
+            "character.metadata.tsv",
+            [
+                "Movie_ID", "Freebase_ID", "Release_Date", "Character_Name", "Actor_Birthdate",
+                "Actor_Gender", "Actor_Height", "Actor_Ethnicity", "Actor_Name", "Actor_Age",
+                "Freebase_Char_ID_1", "Freebase_Char_ID_2", "Freebase_Char_ID_3"
+            ],
+            {
+                "Movie_ID": "int32", "Freebase_ID": str, "Release_Date": str,
+                "Character_Name": str, "Actor_Birthdate": str, "Actor_Gender": "category",
+                "Actor_Height": "float32", "Actor_Ethnicity": "category", "Actor_Name": str,
+                "Actor_Age": "Int16", "Freebase_Char_ID_1": str, "Freebase_Char_ID_2": str,
+                "Freebase_Char_ID_3": str
+            },
+            # The wide name and Freebase ID columns are never queried, so they're not parsed
+            ["Movie_ID", "Actor_Birthdate", "Actor_Gender", "Actor_Height"]
+        ),
+        "movie_metadata": (
+            "movie.metadata.tsv",
+            [
+                "Movie_ID", "Freebase_ID", "Movie_Title", "Release_Date", "Revenue",
+                "Runtime", "Languages", "Countries", "Genres"
+            ],
+            {
+                "Movie_ID": "int32", "Freebase_ID": str, "Movie_Title": str,
+                "Release_Date": str, "Revenue": "float64", "Runtime": "float32",
+                "Languages": str, "Countries": str, "Genres": str
+            },
+            # The Freebase ID and the wide language and country dicts are never queried
+            ["Movie_ID", "Movie_Title", "Release_Date", "Revenue", "Runtime", "Genres"]
+        ),
+        "name_clusters": (
+            "name.clusters.txt",
+            ["Character_Name", "Freebase_ID"],
+            str,
+            None
+        ),
+        "plot_summaries": (
+            "plot_summaries.txt",
+            ["Movie_ID", "Plot_Summary"],
+            {"Movie_ID": "int32", "Plot_Summary": str},
+            None
+        ),
+        "tv_tropes_clusters": (
+            "tvtropes.clusters.txt",
+            ["Trope", "Character_Movie_Details"],
+            str,
+            None
+        ),
+    }
+
+    def __init__(self, preload=False):
+        """
+        Make sure the dataset is downloaded and extracted. The DataFrames are parsed lazily
+        on first access, unless preload is True.
 
-    def __init__(self):
-        if self.FILE_NAME.exists() and self.EXTRACTED_DIR.exists():
+        :param preload: bool, parse all datasets right away instead of on first use
+        """
+        # Query results keyed by (method name, arguments); the datasets never change
+        self._query_cache = {}
+        # Figure reused by actor_distributions(plot=True) across calls
+        self._height_figure = None
+        # Shuffled order of merged_df rows handed out by get_random_movie, and the next position in it
+        self._rng = np.random.default_rng()
+        self._movie_order = None
+        self._movie_pos = 0
+        # The processor is shared between Streamlit sessions, so the position is read and advanced under a lock
+        self._movie_lock = threading.Lock()
+
+        if self.EXTRACTED_MARKER.exists():
             print("Dataset already downloaded and extracted. Skipping...")
         else:
             self._ensure_download_dir()
-            self._download_data()
-            self._extract_data()
+            if self.FILE_NAME.exists() or self.PARTIAL_FILE.exists():
+                self._download_data()
+                self._extract_data()
+            else:
+                self._download_and_extract()
 
-        self._load_data()
+        if preload:
+            self._load_data()
 
     def _ensure_download_dir(self):
         """Ensure the download directory exists."""
         self.DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+    @cached_property
+    def _ollama(self):
+        """Ollama client shared by all LLM calls, so they reuse one HTTP connection pool."""
+        return ollama.Client()
+
+    @cached_property
+    def _summary_cache(self):
+        """
+        SQLite database of the LLM output produced so far: movie summaries keyed by title,
+        and genre classifications keyed by a hash of the model, instructions and summary.
+        """
+        self._ensure_download_dir()
+        connection = sqlite3.connect(self.SUMMARY_CACHE, check_same_thread=False)
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS summaries (title TEXT PRIMARY KEY, summary TEXT)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS classifications (summary_hash TEXT PRIMARY KEY, genres TEXT)"
+            )
+        return connection
+
+    def _cached_summary(self, movie_title):
+        """Return the stored summary for movie_title, or None if it hasn't been generated yet."""
+        row = self._summary_cache.execute(
+            "SELECT summary FROM summaries WHERE title = ?", (movie_title,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store_summary(self, movie_title, summary):
+        """Store a generated summary so the LLM isn't asked for the same movie again."""
+        with self._summary_cache:
+            self._summary_cache.execute(
+                "INSERT OR REPLACE INTO summaries (title, summary) VALUES (?, ?)", (movie_title, summary)
+            )
+
+    def _classification_key(self, summary, prompt):
+        """
+        Short fingerprint of a classification request, used as its key in the classification
+        cache. It covers the model and the instructions as well as the summary, so changing
+        LLM_MODEL or a prompt doesn't serve answers given to the old ones.
+        """
+        request = "\0".join((self.LLM_MODEL, prompt, summary))
+        return hashlib.blake2b(request.encode(), digest_size=16).hexdigest()
+
+    def _cached_genres(self, summary, prompt):
+        """Return the stored classification of summary under prompt, or None if it hasn't been classified yet."""
+        row = self._summary_cache.execute(
+            "SELECT genres FROM classifications WHERE summary_hash = ?", (self._classification_key(summary, prompt),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store_genres(self, summary, prompt, genres):
+        """Store a genre classification so the same request isn't sent to the LLM again."""
+        with self._summary_cache:
+            self._summary_cache.execute(
+                "INSERT OR REPLACE INTO classifications (summary_hash, genres) VALUES (?, ?)",
+                (self._classification_key(summary, prompt), genres)
+            )
+
+    @cached_property
+    def _session(self):
+        """HTTP session shared by all downloads, so requests reuse pooled connections."""
+        session = requests.Session()
+        # One pooled connection per parallel range download
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.DOWNLOAD_WORKERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _download_and_extract(self):
+        """
+        Stream the archive straight from the HTTP response into tarfile, so extraction
+        overlaps the download and no intermediate tar.gz is written. Falls back to
+        downloading the archive to disk and extracting it from there on failure.
+        """
+        print("Downloading and extracting dataset...")
+        try:
+            with self._session.get(self.DATA_URL, stream=True, timeout=self.REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                # "r|gz" reads the archive as a forward-only stream; "r:gz" needs to seek.
+                with tarfile.open(fileobj=response.raw, mode="r|gz", bufsize=self.CHUNK_SIZE) as tar:
+                    tar.extractall(self.DOWNLOAD_DIR, **TAR_FILTER)
+            self.EXTRACTED_MARKER.touch()
+            print("Download and extraction complete.")
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            print(f"Streaming extraction failed ({e}). Falling back to a full download...")
+            shutil.rmtree(self.EXTRACTED_DIR, ignore_errors=True)
+            self._download_data()
+            self._extract_data()
+
     def _download_data(self):
-        """Download the dataset if it does not already exist."""
-        if not self.FILE_NAME.exists():
-            print("Downloading dataset...")
-            response = requests.get(self.DATA_URL, stream=True)
-            with open(self.FILE_NAME, "wb") as f:
-                for chunk in response.iter_content(chunk_size=1024):
-                    f.write(chunk)
-            print("Download complete.")
+        """
+        Download the dataset archive. The download goes to PARTIAL_FILE, which is only
+        renamed to FILE_NAME once every byte has arrived, so an existing FILE_NAME is
+        complete. A partial file left by an interrupted sequential download is resumed
+        with a Range request instead of being downloaded again.
+        """
+        if self.FILE_NAME.exists():
+            return
+
+        try:
+            head = self._session.head(self.DATA_URL, allow_redirects=True, timeout=self.REQUEST_TIMEOUT)
+            head.raise_for_status()
+            total = int(head.headers.get("Content-Length", 0))
+            # Byte ranges only line up with the file on disk if the body isn't re-encoded
+            ranged = total > 0 and "Content-Encoding" not in head.headers
+        except (requests.RequestException, ValueError):
+            # Some servers reject HEAD but serve GET; without a known length, download in one stream
+            total, ranged = 0, False
+
+        current = self.PARTIAL_FILE.stat().st_size if self.PARTIAL_FILE.exists() else 0
+        # Only a partial file shorter than the archive is a resumable prefix; a full-size one
+        # may be a preallocated range download that was killed before all ranges arrived
+        if current and not (ranged and current < total):
+            self.PARTIAL_FILE.unlink()
+            current = 0
+
+        print("Downloading dataset...")
+        if current:
+            print(f"Resuming partial download at byte {current}...")
+            completed = self._download_range(current, total - 1)
+        else:
+            # Split the archive into byte ranges fetched over parallel connections
+            completed = ranged and self._download_ranges(total)
+        if not completed:
+            self._download_stream()
+        self.PARTIAL_FILE.replace(self.FILE_NAME)
+        print("Download complete.")
+
+    def _download_stream(self):
+        """Download the whole archive over a single connection."""
+        with self._session.get(self.DATA_URL, stream=True, timeout=self.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            # Copy straight from the raw socket in large blocks instead of
+            # looping over small iter_content chunks in Python.
+            response.raw.decode_content = True
+            with open(self.PARTIAL_FILE, "wb") as f:
+                shutil.copyfileobj(response.raw, f, length=self.CHUNK_SIZE)
+
+    def _download_ranges(self, total):
+        """
+        Download the archive as parallel HTTP Range requests into a preallocated file.
+
+        :param total: int, the size of the archive in bytes
+        :return: bool, False if the server ignored the Range header
+        """
+        step = -(-total // self.DOWNLOAD_WORKERS)
+        ranges = [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+
+        with open(self.PARTIAL_FILE, "wb") as f:
+            f.truncate(total)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS) as executor:
+                completed = list(executor.map(lambda r: self._download_range(*r), ranges))
+        except BaseException:
+            # The preallocated file has holes where ranges are missing, so it can't be resumed
+            self.PARTIAL_FILE.unlink(missing_ok=True)
+            raise
+
+        if not all(completed):
+            self.PARTIAL_FILE.unlink()
+            return False
+        return True
+
+    def _download_range(self, start, end):
+        """Write bytes start..end (inclusive) of the archive to the same offset in PARTIAL_FILE."""
+        headers = {"Range": f"bytes={start}-{end}"}
+        with self._session.get(self.DATA_URL, headers=headers, stream=True, timeout=self.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return False
+            with open(self.PARTIAL_FILE, "r+b") as f:
+                f.seek(start)
+                shutil.copyfileobj(response.raw, f, length=self.CHUNK_SIZE)
+        return True
 
     def _extract_data(self):
         """Extract dataset if not already extracted."""
-        extracted_path = self.DOWNLOAD_DIR / "MovieSummaries"
-        if not extracted_path.exists():
+        if not self.EXTRACTED_MARKER.exists():
             print("Extracting dataset...")
             try:
-                with tarfile.open(self.FILE_NAME, "r:gz") as tar:
-                    tar.extractall(self.DOWNLOAD_DIR)
+                if shutil.which("pigz"):
+                    self._extract_with_pigz()
+                elif HAS_ISAL:
+                    self._extract_with_isal()
+                else:
+                    # Single forward pass over the archive, reading the gzip stream
+                    # in CHUNK_SIZE blocks rather than tarfile's default 10 KiB.
+                    with tarfile.open(self.FILE_NAME, "r|gz", bufsize=self.CHUNK_SIZE) as tar:
+                        tar.extractall(self.DOWNLOAD_DIR, **TAR_FILTER)
+                self.EXTRACTED_MARKER.touch()
                 print("Extraction complete.")
             except tarfile.TarError:
-                print("Error: File is not a valid tar.gz archive.")
-
-    def _load_data(self):
-        """Load datasets into pandas DataFrames, converting columns to string labels."""
-        print("Loading datasets into pandas DataFrames...")
+                # The archive is corrupt, so fetch it again next time
+                print("Error: File is not a valid tar.gz archive. Removing it.")
+                self.FILE_NAME.unlink(missing_ok=True)
+
+    def _extract_with_pigz(self):
+        """Decompress the archive with pigz in a subprocess and untar its output as a stream."""
+        with subprocess.Popen(
+            ["pigz", "-dc", str(self.FILE_NAME)], stdout=subprocess.PIPE, bufsize=self.CHUNK_SIZE
+        ) as proc:
+            with tarfile.open(fileobj=proc.stdout, mode="r|", bufsize=self.CHUNK_SIZE) as tar:
+                tar.extractall(self.DOWNLOAD_DIR, **TAR_FILTER)
+        if proc.returncode != 0:
+            raise tarfile.TarError(f"pigz exited with status {proc.returncode}")
+
+    def _extract_with_isal(self):
+        """Decompress the archive with ISA-L on background threads and untar its output as a stream."""
         try:
-            self.character_metadata = pd.read_csv(self.EXTRACTED_DIR / "character.metadata.tsv", 
-                                                 sep='\t', header=None)
-            self.movie_metadata = pd.read_csv(self.EXTRACTED_DIR / "movie.metadata.tsv", 
-                                              sep='\t', header=None)
-            self.name_clusters = pd.read_csv(self.EXTRACTED_DIR / "name.clusters.txt", 
-                                             sep='\t', header=None)
-            self.plot_summaries = pd.read_csv(self.EXTRACTED_DIR / "plot_summaries.txt", 
-                                              sep='\t', header=None)
-            self.tv_tropes_clusters = pd.read_csv(self.EXTRACTED_DIR / "tvtropes.clusters.txt", 
-                                                 sep='\t', header=None)
-
-            # Assign column names to movie_metadata
-            self.movie_metadata.columns = [
-                "Movie_ID", "Freebase_ID", "Movie_Title", "Release_Date", "Revenue",
-                "Runtime", "Languages", "Countries", "Genres"
-            ]
+            with igzip_threaded.open(self.FILE_NAME, "rb", threads=self.EXTRACT_THREADS) as gz:
+                with tarfile.open(fileobj=gz, mode="r|", bufsize=self.CHUNK_SIZE) as tar:
+                    tar.extractall(self.DOWNLOAD_DIR, **TAR_FILTER)
+        except (gzip.BadGzipFile, EOFError, IsalError) as e:
+            # Report a broken gzip stream the same way tarfile's own gz mode does
+            raise tarfile.ReadError(f"invalid compressed data: {e}") from e
+
+    def _read_tsv(self, name):
+        """
+        Read one of the headerless TSV files of the corpus, as described in DATASETS.
+
+        Column names are passed to the parser directly and known dtypes are given up front,
+        so pandas neither type-infers those columns nor has to rename them afterwards. The
+        dtypes are the smallest that fit (float32, Int16, category for repeated values), and
+        columns that are never queried are skipped by the parser.
+        Uses the multi-threaded pyarrow engine when pyarrow is installed, and caches the
+        parsed frame as Parquet next to the TSV so later runs skip parsing entirely. A
+        .version file next to the cache records what it was built from.
+
+        :param name: str, the key of the dataset in DATASETS
+        :return: pandas DataFrame
+        """
+        file_name, names, dtype, usecols = self.DATASETS[name]
+        path = self.EXTRACTED_DIR / file_name
+        cache_path = path.with_suffix(".parquet")
+        # The cache is only used if it was built from the current extraction with the current
+        # DATASETS entry, so re-extracting or changing a dtype rebuilds it
+        version_path = cache_path.with_suffix(".parquet.version")
+        marker_time = self.EXTRACTED_MARKER.stat().st_mtime_ns if self.EXTRACTED_MARKER.exists() else 0
+        version = f"{marker_time}:{self.DATASETS[name]!r}"
+        # Files are memory-mapped, so warm pages come straight from the OS page cache
+        if HAS_PYARROW and cache_path.exists() and version_path.exists() and version_path.read_text() == version:
+            return pd.read_parquet(cache_path, columns=usecols, memory_map=True)
+
+        print(f"Loading {file_name} into a pandas DataFrame...")
+        if HAS_PYARROW:
+            # pandas' pyarrow engine mislabels columns when names and usecols are combined,
+            # so it parses every column and the unused ones are dropped right after
+            df = pd.read_csv(path, sep="\t", header=None, names=names, dtype=dtype, engine="pyarrow")
+            if usecols is not None:
+                df = df[usecols]
+        else:
+            df = pd.read_csv(
+                path, sep="\t", header=None, names=names, usecols=usecols, dtype=dtype,
+                engine="c", low_memory=False, memory_map=True
+            )
 
-            # Assign column names to character_metadata
-            self.character_metadata.columns = [
-                "Movie_ID", "Freebase_ID", "Release_Date", "Character_Name", "Actor_Birthdate",
-                "Actor_Gender", "Actor_Height", "Actor_Ethnicity", "Actor_Name", "Actor_Age",
-                "Freebase_Char_ID_1", "Freebase_Char_ID_2", "Freebase_Char_ID_3"
-            ]
+        if HAS_PYARROW:
+            # Write then rename, so an interrupted run never leaves a truncated cache behind
+            partial_path = cache_path.with_suffix(".parquet.partial")
+            df.to_parquet(partial_path, compression="zstd")
+            partial_path.replace(cache_path)
+            version_path.write_text(version)
+        return df
+
+    @cached_property
+    def character_metadata(self):
+        """Character metadata, parsed on first access and sorted by Movie_ID."""
+        df = self._read_tsv("character_metadata")
+        # Keep each movie's characters in one contiguous run of rows
+        if not df["Movie_ID"].is_monotonic_increasing:
+            df = df.sort_values("Movie_ID", kind="stable", ignore_index=True)
+        return df
+
+    @cached_property
+    def movie_metadata(self):
+        """Movie metadata, parsed on first access."""
+        return self._read_tsv("movie_metadata")
+
+    @cached_property
+    def name_clusters(self):
+        """Character name clusters, parsed on first access."""
+        return self._read_tsv("name_clusters")
+
+    @cached_property
+    def plot_summaries(self):
+        """Plot summaries, parsed on first access."""
+        return self._read_tsv("plot_summaries")
+
+    @cached_property
+    def tv_tropes_clusters(self):
+        """TV tropes clusters, parsed on first access."""
+        return self._read_tsv("tv_tropes_clusters")
+
+    @cached_property
+    def merged_df(self):
+        """Movies that have both metadata and a plot summary."""
+        return pd.merge(
+            self.movie_metadata,
+            self.plot_summaries,
+            on="Movie_ID",
+            how="inner"  # only keep rows that exist in both
+        )
 
+    # Columns the analytics query, derived once into contiguous typed arrays
 
-            # Assign column names to name_clusters
-            self.name_clusters.columns = [
-                "Character_Name", "Freebase_ID"
-            ]
+    @cached_property
+    def _movie_fields(self):
+        """Titles, plot summaries and raw genre dicts of merged_df, as NumPy arrays."""
+        return (
+            self.merged_df["Movie_Title"].to_numpy(),
+            self.merged_df["Plot_Summary"].to_numpy(),
+            self.merged_df["Genres"].to_numpy(),
+        )
 
-            # Assign column names to plot_summaries
-            self.plot_summaries.columns = [
-                "Movie_ID", "Plot_Summary"
-            ]
+    @staticmethod
+    def _genre_names(genre_dict_str):
+        """
+        Genre names of one Freebase genre dict, e.g. {"/m/07s9rl0": "Drama", "/m/01z4y": "Comedy"}.
+        Parsed as JSON, so escapes like \\u00e0 are decoded the same way as in parse_genre_dictionary.
+        """
+        try:
+            genre_dict = json.loads(genre_dict_str)
+        except (ValueError, TypeError):
+            return []
+        return list(genre_dict.values()) if isinstance(genre_dict, dict) else []
+
+    @cached_property
+    def _genre_lists(self):
+        """Per-movie lists of genre names, parsed once from the Genres column."""
+        return self.movie_metadata["Genres"].dropna().map(self._genre_names)
+
+    @cached_property
+    def _genre_counts(self):
+        """Number of movies listing each genre, as a Counter."""
+        return Counter(chain.from_iterable(self._genre_lists))
+
+    @cached_property
+    def _genre_index(self):
+        """Genre name -> index labels (in movie_metadata) of the movies listing that genre."""
+        genres = self._genre_lists.explode().dropna()
+        return genres.index.groupby(genres.to_numpy())
+
+    @cached_property
+    def _heights(self):
+        """Actor heights as a float32 array; invalid or missing heights are NaN."""
+        return pd.to_numeric(self.character_metadata["Actor_Height"], errors="coerce").to_numpy(dtype=np.float32)
+
+    @cached_property
+    def _genders(self):
+        """Actor genders as a categorical Series."""
+        return self.character_metadata["Actor_Gender"].astype("category")
+
+    @cached_property
+    def _sorted_heights(self):
+        """Gender ("All" or a category) -> sorted float32 array of the known heights of those actors."""
+        known = ~np.isnan(self._heights)
+        sorted_heights = {"All": np.sort(self._heights[known])}
+        for code, gender in enumerate(self._genders.cat.categories):
+            sorted_heights[gender] = np.sort(self._heights[known & (self._gender_codes == code)])
+        return sorted_heights
+
+    @cached_property
+    def _gender_codes(self):
+        """Category codes of _genders as a contiguous int8 array; -1 where the gender is missing."""
+        return self._genders.cat.codes.to_numpy(dtype=np.int8)
+
+    @staticmethod
+    def _date_field(dates, start, stop):
+        """
+        Slice a fixed-position field out of ISO-8601 (YYYY-MM-DD) date strings, which is
+        much cheaper than running a regex over every date.
 
-            # Assign column names to tv_tropes_clusters
-            self.tv_tropes_clusters.columns = [
-                "Trope", "Character_Movie_Details"
-            ]
+        :param dates: pandas Series of str, the dates
+        :param start: int, index of the first character of the field
+        :param stop: int, index just past the last character of the field
+        :return: pandas Series of int, the field of each date where it is all digits
+        """
+        field = dates.str.slice(start, stop)
+        return field[field.str.isdigit() & (field.str.len() == stop - start)].astype(int)
+
+    @cached_property
+    def _release_years(self):
+        """Release year of each movie that has one as int16, indexed like movie_metadata."""
+        dates = self.movie_metadata["Release_Date"].dropna().astype(str)
+        return self._date_field(dates, 0, 4).astype(np.int16)
+
+    @cached_property
+    def _birth_years(self):
+        """Birth year of each actor whose birthdate has one, as int16."""
+        birthdates = self.character_metadata["Actor_Birthdate"].dropna().astype(str)
+        return self._date_field(birthdates, 0, 4).astype(np.int16)
+
+    @cached_property
+    def _birth_months(self):
+        """Birth month of each actor with a full birthdate, as int8."""
+        birthdates = self.character_metadata["Actor_Birthdate"].dropna().astype(str)
+        # Year-month dates (YYYY-MM) aren't counted towards a month, only full dates are
+        full_dates = birthdates[birthdates.str.slice(7, 8) == "-"]
+        return self._date_field(full_dates, 5, 7).astype(np.int8)
+
+    @cached_property
+    def _actors_per_movie(self):
+        """Number of characters listed for each movie, as an integer array."""
+        ids = self.character_metadata["Movie_ID"].to_numpy()
+        # Rows are sorted by movie, so the counts are the lengths of the runs of equal IDs
+        run_starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]][:ids.size])
+        return np.diff(np.r_[run_starts, ids.size])
+
+    def _cached_query(self, key, compute):
+        """
+        Return the result of a query method, computing it only on the first call.
 
-            ### THis is new
-            self.merged_df = pd.merge(
-            self.movie_metadata, 
-            self.plot_summaries,
-            on="Movie_ID",
-            how="inner"  # only keep rows that exist in both
-            )       
-            ####   
+        :param key: tuple, the method name followed by its arguments
+        :param compute: callable that builds the result DataFrame
+        :return: a copy of the cached DataFrame, so callers can't modify the cached one
+        """
+        if key not in self._query_cache:
+            self._query_cache[key] = compute()
+        return self._query_cache[key].copy()
+
+    def _load_data(self):
+        """Parse all five datasets up front, reading the files in parallel."""
+        print("Loading datasets into pandas DataFrames...")
+        try:
+            # read_csv releases the GIL while parsing, so threads overlap the five files
+            with ThreadPoolExecutor(max_workers=len(self.DATASETS)) as executor:
+                futures = [executor.submit(getattr, self, name) for name in self.DATASETS]
+            for future in futures:
+                future.result()
+            self.merged_df  # merge the frames parsed above
 
         except Exception as e:
             print(f"Error loading datasets: {e}")
@@ -141,40 +641,38 @@ class MovieDataProcessor:
         if "Genres" not in self.movie_metadata.columns:
             raise KeyError("Column 'Genres' not found in movie_metadata. Check dataset format.")
 
-        # Extract the movie types from the Genres column
-        all_genres = []
-        for row in self.movie_metadata["Genres"].dropna():
-            try:
-                # row could be a string or already a dict
-                genre_dict = ast.literal_eval(row) if isinstance(row, str) else row
-                all_genres.extend(genre_dict.values())
-            except (SyntaxError, ValueError):
-                continue
+        # The genre counts are parsed once and cached, so this check costs a len() after the first call
+        if N > len(self._genre_counts):
+            raise KeyError("N is larger than the available movie types")
 
-        # Count occurrences of each movie type
-        type_counts = pd.Series(all_genres).value_counts().reset_index()
-        type_counts.columns = ['Movie_Type', 'Count']
+        return self._cached_query(("movie_type", N), lambda: self._count_movie_types(N))
 
-        if N > len(type_counts):
-            raise KeyError("N is larger than the available movie types")
+    def _count_movie_types(self, N):
+        """Count the N most common movie types; backs movie_type."""
+        # Occurrences of each movie type, counted once for all values of N
+        type_counts = self._genre_counts
 
-        return type_counts.head(N)
+        # most_common(N) only partially sorts the counts to pick the top N
+        return pd.DataFrame(type_counts.most_common(N), columns=['Movie_Type', 'Count'])
 
     def actor_count(self):
         """
         Computes a histogram of the number of actors per movie.
         Returns a DataFrame with columns ['Number_of_Actors', 'Movie_Count'].
+        The histogram is computed once and cached, since the data never changes.
         """
-        # Group by "Movie_ID" instead of column "0"
-        actor_counts = self.character_metadata.groupby("Movie_ID").size()
-        
-        # Compute histogram of number of actors per movie
-        hist = actor_counts.value_counts().reset_index()
-        hist.columns = ['Number_of_Actors', 'Movie_Count']
-        hist = hist.sort_values('Number_of_Actors').reset_index(drop=True)
-        
-        return hist
-        
+        return self._cached_query(("actor_count",), self._count_actors)
+
+    def _count_actors(self):
+        """Build the actors-per-movie histogram; backs actor_count."""
+        # Compute histogram of number of actors per movie, already sorted by actor count
+        movie_counts = np.bincount(self._actors_per_movie)
+        number_of_actors = np.flatnonzero(movie_counts)
+        return pd.DataFrame({
+            "Number_of_Actors": number_of_actors.astype(np.int32),
+            "Movie_Count": movie_counts[number_of_actors].astype(np.int32)
+        })
+
     def actor_distributions(
             self,
             gender: str,
@@ -183,7 +681,8 @@ class MovieDataProcessor:
             plot: bool = False
     ) -> pd.DataFrame:
         """
-        Returns a DataFrame of height distributions filtered by gender and height range.
+        Returns a histogram of actor heights filtered by gender and height range.
+        The range is split into HEIGHT_BINS equal-width bins; 'Height' is the centre of each bin.
         Optionally plots the distribution.
         """
 
@@ -191,14 +690,6 @@ class MovieDataProcessor:
         if "Actor_Gender" not in self.character_metadata.columns or "Actor_Height" not in self.character_metadata.columns:
             raise KeyError("Required columns 'Actor_Gender' or 'Actor_Height' not found in character_metadata.")
 
-        df_actors = self.character_metadata.copy()
-
-        # ✅ Keep only numeric height values (remove invalid ones)
-        df_actors = df_actors[df_actors["Actor_Height"].astype(str).str.match(r'^\d+(\.\d+)?$', na=False)]
-
-        # ✅ Convert height to float after removing invalid values
-        df_actors["Actor_Height"] = df_actors["Actor_Height"].astype(float)
-
         # Validate input types
         if not all(isinstance(val, (int, float)) for val in [min_height, max_height]):
             raise ValueError("Max and min heights must be numerical values.")
@@ -206,35 +697,54 @@ class MovieDataProcessor:
         if min_height >= max_height:
             raise ValueError("min_height must be less than max_height.")
 
-        # Filter by gender
-        available_genders = df_actors["Actor_Gender"].dropna().unique()
+        available_genders = self._genders.cat.categories
         if gender != "All" and gender not in available_genders:
-            raise ValueError(f"Invalid gender selection. Available options: {available_genders}")
-        if gender != "All":
-            df_actors = df_actors[df_actors["Actor_Gender"] == gender]
+            raise ValueError(f"Invalid gender selection. Available options: {list(available_genders)}")
 
-        # Filter height range
-        df_actors = df_actors[(df_actors["Actor_Height"] >= min_height) & (df_actors["Actor_Height"] <= max_height)]
+        height_counts = self._cached_query(
+            ("actor_distributions", gender, max_height, min_height),
+            lambda: self._height_histogram(gender, max_height, min_height)
+        )
 
         # Check if data remains after filtering
-        if df_actors.empty:
+        if height_counts.empty:
             print("Warning: No actors found in the given height range.")
-            return pd.DataFrame(columns=["Height", "Count"])
-
-        # Build the histogram
-        height_counts = df_actors["Actor_Height"].value_counts().sort_index().reset_index()
-        height_counts.columns = ["Height", "Count"]
+            return height_counts
 
         # Optional plot
         if plot:
-            plt.figure(figsize=(7, 5))
-            plt.hist(df_actors["Actor_Height"], bins=20, edgecolor="black", alpha=0.7)
+            # Redraw the figure from the previous call if it is still open instead of creating a new one
+            if self._height_figure is None or not plt.fignum_exists(self._height_figure.number):
+                self._height_figure = plt.figure(figsize=(7, 5))
+            plt.figure(self._height_figure.number)
+            plt.clf()
+            # The same edges np.histogram used for the cached counts
+            edges = np.linspace(min_height, max_height, self.HEIGHT_BINS + 1)
+            plt.stairs(height_counts["Count"].to_numpy(), edges, fill=True, edgecolor="black", alpha=0.7)
             plt.xlabel("Actor Height in Meters")
             plt.ylabel("Frequency")
             plt.title(f"Height Distribution For {gender} Actors ({min_height}m - {max_height}m)")
             plt.show()
 
         return height_counts
+
+    def _height_histogram(self, gender, max_height, min_height):
+        """Bin the heights of the selected actors into HEIGHT_BINS bins; backs actor_distributions."""
+        # The heights in range are one contiguous slice of the gender's sorted heights;
+        # the bounds are compared at the heights' float32 precision, as a mask would
+        heights = self._sorted_heights[gender]
+        bounds = np.array([min_height, max_height], dtype=heights.dtype)
+        start = np.searchsorted(heights, bounds[0], side="left")
+        stop = np.searchsorted(heights, bounds[1], side="right")
+        heights = heights[start:stop]
+
+        if heights.size == 0:
+            return pd.DataFrame(columns=["Height", "Count"])
+
+        # Build the histogram in a single pass over the heights
+        counts, edges = np.histogram(heights, bins=self.HEIGHT_BINS, range=(min_height, max_height))
+        return pd.DataFrame({"Height": (edges[:-1] + edges[1:]) / 2, "Count": counts})
+
     def releases(self, genre=None):
         """
         Returns a DataFrame showing the number of movie releases per year.
@@ -248,38 +758,26 @@ class MovieDataProcessor:
         if "Release_Date" not in self.movie_metadata.columns or "Genres" not in self.movie_metadata.columns:
             raise KeyError("Required columns 'Release_Date' or 'Genres' not found in movie_metadata.")
 
-        # Extract relevant columns
-        df_movies = self.movie_metadata[["Release_Date", "Genres"]].copy()
-
-        # Drop missing years
-        df_movies = df_movies.dropna(subset=["Release_Date"])
+        return self._cached_query(("releases", genre), lambda: self._count_releases(genre))
 
-        # Extract the year from dates (if applicable)
-        df_movies["Year"] = df_movies["Release_Date"].astype(str).str.extract(r"(\d{4})")  # Extract four-digit year
-
-        # Convert to integer after extraction
-        df_movies = df_movies.dropna(subset=["Year"])
-        df_movies["Year"] = df_movies["Year"].astype(int)
+    def _count_releases(self, genre):
+        """Count releases per year, optionally for a single genre; backs releases."""
+        # Release years are extracted once and reused across calls
+        years = self._release_years
 
         # If a genre is specified, filter movies that contain that genre
         if genre:
-            def genre_filter(genre_dict):
-                try:
-                    parsed_genres = ast.literal_eval(genre_dict)  # Convert string to dictionary
-                    return genre in parsed_genres.values()
-                except (SyntaxError, ValueError):
-                    return False
-
-            df_movies = df_movies[df_movies["Genres"].apply(genre_filter)]
-            print(f"Data shape after filtering by genre '{genre}':", df_movies.shape)
+            # Look the genre's movies up in the prebuilt index instead of scanning every Genres cell
+            years = years[years.index.isin(self._genre_index.get(genre, []))]
+            print(f"Movies left after filtering by genre '{genre}':", len(years))
 
         # If no valid data remains after filtering, return empty DataFrame
-        if df_movies.empty:
+        if years.empty:
             print(f"No movies found for genre '{genre}'.")
             return pd.DataFrame(columns=["Year", "Movie_Count"])
 
         # Count movies per year
-        releases_per_year = df_movies.groupby("Year").size().reset_index(name="Movie_Count")
+        releases_per_year = years.groupby(years).size().rename_axis("Year").reset_index(name="Movie_Count")
 
         return releases_per_year
 
@@ -294,26 +792,20 @@ class MovieDataProcessor:
         if "Actor_Birthdate" not in self.character_metadata.columns:
             raise KeyError("Required column 'Actor_Birthdate' not found in character_metadata.")
 
-        # Drop missing birthdates
-        df_births = self.character_metadata.dropna(subset=["Actor_Birthdate"]).copy()
-
-        # Extract Year and Month from birthdate
-        df_births["Year"] = df_births["Actor_Birthdate"].astype(str).str.extract(r"(\d{4})")
-        df_births["Month"] = df_births["Actor_Birthdate"].astype(str).str.extract(r"-(\d{2})-")
-
-        # Convert to numeric values
-        df_births["Year"] = pd.to_numeric(df_births["Year"], errors="coerce")
-        df_births["Month"] = pd.to_numeric(df_births["Month"], errors="coerce")
-
         # Default to yearly count if an invalid option is passed
         if group_by not in ["Y", "M"]:
             group_by = "Y"
 
-        # Count occurrences
+        return self._cached_query(("ages", group_by), lambda: self._count_births(group_by))
+
+    def _count_births(self, group_by):
+        """Count actor births per year ('Y') or month ('M'); backs ages."""
+        # Count occurrences of the birth years or months extracted at first use
         if group_by == "Y":
-            birth_counts = df_births.groupby("Year").size().reset_index(name="Birth_Count")
+            births, column = self._birth_years, "Year"
         else:  # group_by == "M"
-            birth_counts = df_births.groupby("Month").size().reset_index(name="Birth_Count")
+            births, column = self._birth_months, "Month"
+        birth_counts = births.groupby(births).size().rename_axis(column).reset_index(name="Birth_Count")
 
         return birth_counts
     
@@ -322,21 +814,112 @@ class MovieDataProcessor:
         """
         Uses Ollama to generate a summary for a given movie title.
 
+        Summaries are stored in SUMMARY_CACHE, so each title is only sent to the LLM once.
+
         :param movie_title: str, the title of the movie
         :return: str, the generated summary
         """
-        prompt = f"Provide a short and engaging summary for the movie '{movie_title}'."
-        
+        summary = self._cached_summary(movie_title)
+        if summary is not None:
+            return ollama.Message(role="assistant", content=summary)
+
         try:
-            response = ollama.chat("mistral", messages=[{"role": "user", "content": prompt}])
+            response = self._ollama.chat(self.LLM_MODEL, messages=self._summary_messages(movie_title))
+            self._store_summary(movie_title, response["message"]["content"])
             return response["message"]
         except Exception as e:
             return f"Error generating summary: {e}"
-        
 
+    def stream_movie_summary(self, movie_title):
+        """
+        Uses Ollama to generate a summary for a given movie title, yielding it piece by piece
+        as the model produces it, so a UI can render the text while it is being generated.
 
+        :param movie_title: str, the title of the movie
+        :return: generator of str, the chunks of the generated summary
+        """
+        summary = self._cached_summary(movie_title)
+        if summary is not None:
+            yield summary
+            return
+
+        chunks = []
+        try:
+            for chunk in self._ollama.chat(self.LLM_MODEL, messages=self._summary_messages(movie_title), stream=True):
+                chunks.append(chunk["message"]["content"])
+                yield chunks[-1]
+        except Exception as e:
+            yield f"Error generating summary: {e}"
+        else:
+            self._store_summary(movie_title, "".join(chunks))
+
+    def generate_movie_summaries(self, movie_titles):
+        """
+        Uses Ollama to generate summaries for several movie titles, sending all requests
+        concurrently so the model can work through them as one batch. Titles that were
+        summarized before are served from SUMMARY_CACHE without calling the LLM.
+
+        Callers that already run an event loop (e.g. a Jupyter notebook) can await
+        generate_movie_summaries_async instead; called from a running loop, this method
+        runs the batch on a helper thread with its own loop.
+
+        :param movie_titles: list of str, the titles of the movies
+        :return: list, the generated summary (or error message) for each title, in order
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.generate_movie_summaries_async(movie_titles))
+        # asyncio.run can't be nested inside a running loop, so give the batch a loop of its own
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.generate_movie_summaries_async(movie_titles)).result()
+
+    async def generate_movie_summaries_async(self, movie_titles):
+        """
+        Async variant of generate_movie_summaries, for callers that already run an event loop.
+
+        :param movie_titles: list of str, the titles of the movies
+        :return: list, the generated summary (or error message) for each title, in order
+        """
+        summaries = {}
+        for title in movie_titles:
+            summary = self._cached_summary(title)
+            if summary is not None:
+                summaries[title] = ollama.Message(role="assistant", content=summary)
+        # Titles still to generate, each requested once even if it is listed twice
+        missing = list(dict.fromkeys(title for title in movie_titles if title not in summaries))
+
+        if missing:
+            client = ollama.AsyncClient()
+            slots = asyncio.Semaphore(self.LLM_CONCURRENCY)
+
+            async def summarize(movie_title):
+                async with slots:
+                    try:
+                        response = await client.chat(self.LLM_MODEL, messages=self._summary_messages(movie_title))
+                        return response["message"]
+                    except Exception as e:
+                        return f"Error generating summary: {e}"
+
+            try:
+                generated = await asyncio.gather(*(summarize(title) for title in missing))
+            finally:
+                # Release the client's connections before the event loop they were opened on ends
+                await client.close()
+
+            for title, summary in zip(missing, generated):
+                if not isinstance(summary, str):
+                    self._store_summary(title, summary["content"])
+                summaries[title] = summary
+
+        return [summaries[title] for title in movie_titles]
+
+    @staticmethod
+    def _summary_messages(movie_title):
+        """Chat messages asking the LLM to summarize the given movie."""
+        prompt = f"Provide a short and engaging summary for the movie '{movie_title}'."
+        return [{"role": "user", "content": prompt}]
 
-        
     def parse_genre_dictionary(self, genre_dict_str: str) -> str:
             """
             Some rows in 'Genres' might be stored like:
@@ -346,20 +929,19 @@ class MovieDataProcessor:
             :param genre_dict_str: A string representation of a dict
             :return: Comma-separated string of genre values
             """
-            # In many datasets, "Genres" might already be a Python dict. 
-            # If it's a string that *looks* like a dict, we can safely eval it 
-            # (but be aware of security concerns; for a hackathon it’s probably fine).
+            # The Freebase dicts are valid JSON, so the C JSON parser reads them safely
+            # without compiling and running the string as Python code.
             if not genre_dict_str:
                 return ""
 
             try:
-                genre_dict = eval(genre_dict_str)
+                genre_dict = json.loads(genre_dict_str)
                 if isinstance(genre_dict, dict):
                     return ", ".join(genre_dict.values())
                 else:
                     # If it’s not a dict, just return the original or handle accordingly
                     return str(genre_dict_str)
-            except:
+            except (ValueError, TypeError):
                 # If parsing fails, just return the raw string
                 return str(genre_dict_str)
 
@@ -371,12 +953,20 @@ class MovieDataProcessor:
         if self.merged_df.empty:
             raise ValueError("No movie data available.")
 
-        random_idx = random.randint(0, len(self.merged_df) - 1)
-        row = self.merged_df.iloc[random_idx]
+        # Index plain arrays instead of materializing a whole row as a Series
+        titles, summaries, genres = self._movie_fields
+
+        # Walk a shuffled order of all movies, so none repeats before every one has been drawn
+        with self._movie_lock:
+            if self._movie_order is None or self._movie_pos >= len(self._movie_order):
+                self._movie_order = self._rng.permutation(len(titles))
+                self._movie_pos = 0
+            random_idx = self._movie_order[self._movie_pos]
+            self._movie_pos += 1
 
-        title = row["Movie_Title"]
-        summary = row["Plot_Summary"]
-        parsed_genres = self.parse_genre_dictionary(row["Genres"])
+        title = titles[random_idx]
+        summary = summaries[random_idx]
+        parsed_genres = self.parse_genre_dictionary(genres[random_idx])
 
         # Build the pydantic model
         movie_info = MovieInfo(
@@ -386,28 +976,48 @@ class MovieDataProcessor:
         )
         return movie_info
 
-    def classify_genres_with_llm(self, summary: str) -> str:
+    def warm_up_llm(self):
+        """
+        Sends the LLM a one-token genre classification, so the model is loaded and the
+        classifier instructions are in its prompt cache before the first real request.
+
+        :return: None
+        """
+        messages = [
+            {"role": "system", "content": self.GENRE_CLASSIFIER_PROMPT},
+            {"role": "user", "content": "Summary:\nA short movie about cats."},
+        ]
+        try:
+            self._ollama.chat(self.LLM_MODEL, messages=messages, options={"num_predict": 1})
+        except Exception as e:
+            print(f"Could not warm up the LLM: {e}")
+
+    def classify_genres_with_llm(self, summary: str, stream: bool = False):
         """
         Calls your local LLM (e.g. Ollama) to classify the movie's summary into genres.
         Prompt-engineer it so it tries to ONLY output the genre(s).
-        """
-        # Example prompt:
-        prompt = f"""
-You are a helpful assistant that classifies a movie plot into appropriate genres.
-Read the following summary and output ONLY the genres that best describe it.
-No explanations, no extra text. Just the genre(s).
 
-Summary:
-{summary}
+        The instructions are sent as a fixed system message ahead of the summary, so the
+        model can reuse the cached prompt prefix from the previous classification. Results
+        are stored in SUMMARY_CACHE, so a summary that was classified before skips the LLM.
+
+        :param summary: str, the movie summary to classify
+        :param stream: bool, return a generator that yields the genres as they're generated
+        :return: str, the genres (or an error message); a generator of str if stream is True
         """
+        messages = [
+            {"role": "system", "content": self.GENRE_CLASSIFIER_PROMPT},
+            {"role": "user", "content": f"Summary:\n{summary}"},
+        ]
+        if stream:
+            return self._stream_genres(summary, messages)
+
+        genres = self._cached_genres(summary, self.GENRE_CLASSIFIER_PROMPT)
+        if genres is not None:
+            return genres
 
         try:
-            response = ollama.chat(
-                "mistral",  # or whichever model name
-                messages=[{"role": "user", "content": prompt}]
-            )
-            # Print or inspect the structure of the response
-            print(response)  # For debugging, check the actual structure
+            response = self._ollama.chat(self.LLM_MODEL, messages=messages)
 
             if hasattr(response, "message") and hasattr(response.message, "content"):
                 llm_output = response.message.content.strip()  # Accessing 'content' safely
@@ -417,10 +1027,91 @@ Summary:
             if not llm_output:
                 return "No genres found in response."
 
+            self._store_genres(summary, self.GENRE_CLASSIFIER_PROMPT, llm_output)
             return llm_output
         except Exception as e:
             return f"Error during classification: {e}"
-        
+
+    def _stream_genres(self, summary, messages):
+        """Yield the LLM's genre classification chunk by chunk; backs classify_genres_with_llm."""
+        genres = self._cached_genres(summary, self.GENRE_CLASSIFIER_PROMPT)
+        if genres is not None:
+            yield genres
+            return
+
+        chunks = []
+        try:
+            for chunk in self._ollama.chat(self.LLM_MODEL, messages=messages, stream=True):
+                chunks.append(chunk["message"]["content"])
+                yield chunks[-1]
+        except Exception as e:
+            yield f"Error during classification: {e}"
+        else:
+            genres = "".join(chunks).strip()
+            if genres:
+                self._store_genres(summary, self.GENRE_CLASSIFIER_PROMPT, genres)
+
+    def classify_many(self, summaries, batch_size=8):
+        """
+        Classifies several movie summaries into genres, packing batch_size summaries into
+        each LLM request instead of sending one request per summary.
+
+        The LLM's reply is constrained to the GenreClassifications JSON schema, and each item
+        echoes the number of its summary, so genres are matched to summaries by number rather
+        than by position. A reply that doesn't cover exactly the batch's numbers is reported as
+        an error and not cached. Summaries already classified with the batch prompt skip the
+        LLM; results are cached apart from those of classify_genres_with_llm.
+
+        :param summaries: list of str, the movie summaries to classify
+        :param batch_size: int, the number of summaries sent in a single prompt
+        :return: list of str, the genres (or an error message) for each summary, in order
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        results = [self._cached_genres(summary, self.BATCH_GENRE_CLASSIFIER_PROMPT) for summary in summaries]
+        pending = [i for i, genres in enumerate(results) if genres is None]
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            numbered = "\n\n".join(f"{n}. {summaries[i]}" for n, i in enumerate(batch, start=1))
+
+            try:
+                response = self._ollama.chat(
+                    self.LLM_MODEL,
+                    messages=[
+                        {"role": "system", "content": self.BATCH_GENRE_CLASSIFIER_PROMPT},
+                        {"role": "user", "content": f"Summaries:\n{numbered}"},
+                    ],
+                    format=GenreClassifications.model_json_schema(),
+                    # Several full plots don't fit in the default context window
+                    options={"num_ctx": self.BATCH_CONTEXT_SIZE},
+                )
+                if not (hasattr(response, "message") and hasattr(response.message, "content")):
+                    for i in batch:
+                        results[i] = "Error: Unexpected response format from LLM."
+                    continue
+
+                items = GenreClassifications.model_validate_json(response.message.content).classifications
+                genres = {item.index: item.genres.strip() for item in items}
+                # A dropped, repeated or invented number would shift genres onto the wrong summaries
+                if len(items) != len(batch) or set(genres) != set(range(1, len(batch) + 1)):
+                    for i in batch:
+                        results[i] = "Error: LLM reply doesn't match the summaries sent."
+                    continue
+
+                for n, i in enumerate(batch, start=1):
+                    llm_output = genres[n]
+                    if llm_output:
+                        self._store_genres(summaries[i], self.BATCH_GENRE_CLASSIFIER_PROMPT, llm_output)
+                        results[i] = llm_output
+                    else:
+                        results[i] = "No genres found in response."
+            except Exception as e:
+                for i in batch:
+                    results[i] = f"Error during classification: {e}"
+
+        return results
+
     def evaluate_llm_classification(self, db_genres: str, llm_genres: str) -> str:
         """
         Asks the LLM to compare the genres from the database with its own classified genres
@@ -452,8 +1143,8 @@ Summary:
     """
 
         try:
-            response = ollama.chat(
-                "mistral",  # or whichever model you are using
+            response = self._ollama.chat(
+                self.LLM_MODEL,
                 messages=[{"role": "user", "content": prompt}]
             )
 
@@ -467,7 +1158,7 @@ Summary:
         except Exception as e:
             return f"Error during evaluation: {e}"
 
-    def personalize_movie_plot(self, name: str, api_key: str) -> str:
+    def personalize_movie_plot(self, name: str, api_key: str, client: Optional[OpenAI] = None) -> str:
         """
         Creates a personalized movie plot based on a random movie but with the given name as the main character.
         
@@ -478,6 +1169,8 @@ Summary:
         
         :param name: str, the name of the person to make the main character
         :param api_key: str, the OpenAI API key to use for the request
+        :param client: OpenAI, a client for api_key to reuse across requests (default: None,
+            a new client is created for this request only; the processor never keeps the key)
         :return: str, the personalized movie plot
         
         :raises ValueError: If name is empty or invalid or if the API key is empty
@@ -497,27 +1190,21 @@ Summary:
             # Get a random movie
             movie_info = self.get_random_movie()
             
-            # Create prompt for OpenAI
-            prompt = f"""
-    Rewrite the following movie plot to make a person named "{name}" the main character.
-    Make appropriate adjustments to the storyline to naturally incorporate "{name}" as the protagonist,
-    while keeping the core plot elements, setting, and theme intact.
-    
-    Original Movie: "{movie_info.title}"
-    Original Plot: {movie_info.summary}
-    
-    Please provide ONLY the rewritten plot, no explanations or other text.
-    """
+            # Create prompt for OpenAI; the instructions are the fixed system message, so only
+            # this trailing part differs between requests
+            prompt = f"""Name: "{name}"
+Original Movie: "{movie_info.title}"
+Original Plot: {movie_info.summary}"""
             
             try:
-                # Create a temporary OpenAI client with the provided API key
-                client = OpenAI(api_key=api_key)
+                if client is None:
+                    client = OpenAI(api_key=api_key)
                 
                 # Call OpenAI API
                 response = client.chat.completions.create(
                     model="gpt-4o",  
                     messages=[
-                        {"role": "system", "content": "You are a creative assistant that rewrites movie plots."},
+                        {"role": "system", "content": self.PLOT_PERSONALIZER_PROMPT},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.7,
@@ -1,7 +1,11 @@
+import hashlib
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")  # the server renders to images only, so skip probing for a GUI backend
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
 import numpy as np
+from openai import OpenAI
 from MovieDataProcessor import MovieDataProcessor
 
 # Configure page settings and layout
@@ -20,109 +24,203 @@ if "max_height" not in st.session_state:
 
 st.title("Movie Data Processor")
 
-# Cache the processor so it doesn't reload on every UI interaction
-@st.cache_data
+# Genres offered in the release-year dropdown
+AVAILABLE_GENRES = ["Action", "Comedy", "Drama", "Horror", "Romance", "Science Fiction", "Fantasy", "Thriller", "Documentary", "Animation"]
+
+# Share one processor across reruns and sessions so it doesn't reload on every UI interaction;
+# cache_resource keeps the object itself instead of pickling it like cache_data would.
+# Its query methods memoize their own results, so the plots below reuse them on reruns.
+@st.cache_resource
 def load_processor():
-    return MovieDataProcessor()
+    processor = MovieDataProcessor()
+    # Compute the aggregations behind the default views once at startup, so the first
+    # interaction only slices cached results; movie_type(N) reuses one set of genre counts
+    processor.movie_type(1)
+    processor.actor_count()
+    # There are only a handful of genres to choose from, so every dropdown choice is ready up front
+    for genre in [None] + AVAILABLE_GENRES:
+        processor.releases(genre)
+    processor.ages("Y")
+    processor.ages("M")
+    # Load the LLM now rather than on the first Shuffle click
+    processor.warm_up_llm()
+    return processor
 
 processor = load_processor()
 
-# Navigation Sidebar
-page = st.radio("Go to", ["Main Page", "Chronological Info", "Movie Summarizer", "Become the main character"], horizontal=True)
+
+# The plotted data comes from the processor's query cache, so a rerun only redraws. Each run
+# builds its own Figure, since Agg figures can't be rendered by several sessions at once; they
+# are plain Figure objects rather than pyplot ones, so they're freed once displayed.
+def movie_type_figure(df_movie_type, color):
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.bar(df_movie_type["Movie_Type"], df_movie_type["Count"], color=color)
+    ax.set_xlabel("Movie Type")
+    ax.set_ylabel("Count")
+    ax.set_title("Histogram of Movie Types")
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+    return fig
+
+
+def actor_count_figure(df_actor_count, color):
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.bar(df_actor_count["Number_of_Actors"], df_actor_count["Movie_Count"], color=color)
+    ax.set_xlabel("Number of Actors")
+    ax.set_ylabel("Number of Movies")
+    ax.set_title("Histogram of Number of Actors")
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+    return fig
 
 
-if page == "Main Page":
+def height_figure(result_df, bin_width, color, gender):
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.bar(result_df["Height"] * 100, result_df["Count"], width=bin_width, alpha=0.7, color=color, edgecolor="black")
+    ax.set_xlabel("Height (cm)")
+    ax.set_ylabel("Frequency")
+    ax.set_title(f"Height Distribution ({gender})")
+    return fig
+
+
+def releases_figure(releases_df, color, selected_genre):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(releases_df["Year"], releases_df["Movie_Count"], color=color)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Movies Released")
+    ax.set_xlim(left=1900)
+    ax.set_xlim(right=2030)
+    ax.set_title(f"Movie Releases Over Time ({'All Genres' if not selected_genre else selected_genre})")
+    setp(ax.get_xticklabels(), rotation=45)
+    return fig
+
+
+def births_figure(births_df, color, time_selection):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(births_df.iloc[:, 0], births_df["Birth_Count"], color=color, width=0.9)
+
+    # Set axis labels
+    ax.set_xlabel(time_selection)
+    ax.set_ylabel("Number of Births")
+    ax.set_title(f"Actor Births Per {time_selection}")
+
+    # Adjust x-axis for Yearly and Monthly views
+    if time_selection == "Year":
+        ax.set_xlim(left=1900, right=2010)  # Ensure years are properly displayed
+
+    else:
+        ax.set_xticks(births_df["Month"])  # Ensure ticks align with bars
+        ax.set_xticklabels(["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                            "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+        ax.set_xlim(0.5, 12.5)  # Extend x-axis slightly to prevent cutoff
+    return fig
+
+
+def render_main_page(processor):
+    """Top movie types, actors per movie and the actor height distribution."""
+    # Each section is a fragment, so its widgets rerun only that section and its plot
+    # instead of the whole page
+    render_movie_types(processor)
+    render_actor_count(processor)
+    render_height_distribution(processor)
+
+
+@st.fragment
+def render_movie_types(processor):
+    """Bar chart of the N most common movie types."""
     st.header("Top Movie Types")
-    
-    # 🎨 Add color picker for movie types plot
-    movie_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C0")  # skyblue default
-    
-    N = st.number_input("What number of movie types would you like to see", min_value=1, max_value=50, value=10, step=1)
+
+    # The inputs sit in a form so that changing them reruns the section once, on submit,
+    # rather than once per widget; until then they keep returning their submitted values
+    with st.form("movie_types"):
+        # 🎨 Add color picker for movie types plot
+        movie_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C0")  # skyblue default
+
+        N = st.number_input("What number of movie types would you like to see", min_value=1, max_value=50, value=10, step=1)
+        st.form_submit_button("Update plot")
     df_movie_type = processor.movie_type(N)
     
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.bar(df_movie_type["Movie_Type"], df_movie_type["Count"], color=movie_color)
-    ax.set_xlabel("Movie Type")
-    ax.set_ylabel("Count")
-    ax.set_title("Histogram of Movie Types")
-    plt.xticks(rotation=45, ha="right")
-    st.pyplot(fig)
+    st.pyplot(movie_type_figure(df_movie_type, movie_color))
+
 
+@st.fragment
+def render_actor_count(processor):
+    """Bar chart of the number of movies per number of actors."""
     st.header("Number of Movies versus Number of Actors")
 
     # 🎨 Add color picker for actor count plot
     actor_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C1")  # green default
 
     df_actor_count = processor.actor_count()
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.bar(df_actor_count["Number_of_Actors"], df_actor_count["Movie_Count"], color=actor_color)
-    ax.set_xlabel("Number of Actors")
-    ax.set_ylabel("Number of Movies")
-    ax.set_title("Histogram of Number of Actors")
-    plt.xticks(rotation=45, ha="right")
-    st.pyplot(fig)
+    st.pyplot(actor_count_figure(df_actor_count, actor_color))
+
 
+@st.fragment
+def render_height_distribution(processor):
+    """Histogram of actor heights for a gender and height range."""
     st.header("Actor Height Distribution")
 
-    gender = st.selectbox("Select Gender", ["All", "Male", "Female"])
-    if gender == "Male":
-        gender = "M"
-    elif gender == "Female":
-        gender = "F"
- # Height range selection with validation logic
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Min height input - limit to max_height
-        new_min_height = st.number_input(
-            "Enter Minimum Height (m)", 
-            min_value=1.0, 
-            max_value=st.session_state.max_height,
-            value=st.session_state.min_height, 
-            step=0.1,
-            key="min_height_input"
-        )
-        
-        # Update session state if changed
-        if new_min_height != st.session_state.min_height:
-            st.session_state.min_height = new_min_height
-    
-    with col2:
-        # Max height input - must be >= min_height
-        new_max_height = st.number_input(
-            "Enter Maximum Height (m)", 
-            min_value=st.session_state.min_height, 
-            max_value=2.3,
-            value=max(st.session_state.max_height, st.session_state.min_height), 
-            step=0.1,
-            key="max_height_input"
-        )
-        
-        # Update session state if changed
-        if new_max_height != st.session_state.max_height:
-            st.session_state.max_height = new_max_height
+    # Gender, height range and colour are submitted together, for one rerun instead of four
+    with st.form("height_distribution"):
+        gender = st.selectbox("Select Gender", ["All", "Male", "Female"])
+        if gender == "Male":
+            gender = "M"
+        elif gender == "Female":
+            gender = "F"
+        # Height range selection with validation logic
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Min height input - limit to max_height
+            new_min_height = st.number_input(
+                "Enter Minimum Height (m)", 
+                min_value=1.0, 
+                max_value=st.session_state.max_height,
+                value=st.session_state.min_height, 
+                step=0.1,
+                key="min_height_input"
+            )
+
+        with col2:
+            # Max height input - must be >= min_height
+            new_max_height = st.number_input(
+                "Enter Maximum Height (m)", 
+                min_value=st.session_state.min_height, 
+                max_value=2.3,
+                value=max(st.session_state.max_height, st.session_state.min_height), 
+                step=0.1,
+                key="max_height_input"
+            )
+
+        # 🎨 Add color picker for height distribution plot
+        height_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C2")  # dodgerblue default
+        st.form_submit_button("Update plot")
 
-# 🎨 Add color picker for height distribution plot
-    height_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C2")  # dodgerblue default
+    # Both bounds arrive in one submit, each limited only by the other's previous value, so
+    # check them as a pair; an invalid pair keeps the last valid range
+    if new_min_height < new_max_height:
+        st.session_state.min_height = new_min_height
+        st.session_state.max_height = new_max_height
+    else:
+        st.error("The minimum height must be less than the maximum height. Showing the last valid range.")
 
     # Get DataFrame and plot
     result_df = processor.actor_distributions(gender, st.session_state.max_height, st.session_state.min_height, plot=False)
 
-    # Plot manually with selected color
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.hist(result_df["Height"] * 100, bins=20, alpha=0.7, color=height_color, edgecolor="black")
-    ax.set_xlabel("Height (cm)")
-    ax.set_ylabel("Frequency")
-    ax.set_title(f"Height Distribution ({gender})")
-    st.pyplot(fig)
+    # Plot the precomputed histogram bins manually with selected color
+    bin_width = (st.session_state.max_height - st.session_state.min_height) / processor.HEIGHT_BINS * 100
+    st.pyplot(height_figure(result_df, bin_width, height_color, gender))
 
 
-elif page == "Chronological Info":
+def render_chronological_info(processor):
+    """Movie releases and actor births over time."""
     st.title("Chronological Movie Releases")
     
     # Dropdown for selecting genre
-    available_genres = ["Action", "Comedy", "Drama", "Horror", "Romance", "Science Fiction", "Fantasy", "Thriller", "Documentary", "Animation"]
-    selected_genre = st.selectbox("Select a genre", [None] + available_genres)
+    selected_genre = st.selectbox("Select a genre", [None] + AVAILABLE_GENRES)
     movie_color = st.color_picker("Click and Pick your favorite color!", "#C0C0C0")  # skyblue default
     
     # Retrieve the data
@@ -130,17 +228,7 @@ elif page == "Chronological Info":
     
     if not releases_df.empty:
         # Plot the data
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.bar(releases_df["Year"], releases_df["Movie_Count"], color=movie_color)
-        ax.set_xlabel("Year")
-        ax.set_ylabel("Number of Movies Released")
-        ax.set_xlim(left=1900) 
-        ax.set_xlim(right=2030) 
-        ax.set_title(f"Movie Releases Over Time ({'All Genres' if not selected_genre else selected_genre})")
-        plt.xticks(rotation=45)
-        
-        # Show the plot
-        st.pyplot(fig)
+        st.pyplot(releases_figure(releases_df, movie_color, selected_genre))
     else:
         st.write("No data available for the selected genre.")
     
@@ -159,32 +247,13 @@ elif page == "Chronological Info":
 
     # Ensure all 12 months are represented (if using months)
     if group_by == "M":
-        all_months = pd.DataFrame({"Month": range(1, 13)})
-        births_df = all_months.merge(births_df, on="Month", how="left").fillna(0)
+        births_df = births_df.set_index("Month").reindex(range(1, 13), fill_value=0).rename_axis("Month").reset_index()
 
     # Plot the data
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(births_df.iloc[:, 0], births_df["Birth_Count"], color=movie_color, width=0.9)
-
-    # Set axis labels
-    ax.set_xlabel(time_selection)
-    ax.set_ylabel("Number of Births")
-    ax.set_title(f"Actor Births Per {time_selection}")
-
-    # Adjust x-axis for Yearly and Monthly views
-    if group_by == "Y":
-        ax.set_xlim(left=1900, right=2010)  # Ensure years are properly displayed
-
-    elif group_by == "M":
-        ax.set_xticks(births_df["Month"])  # Ensure ticks align with bars
-        ax.set_xticklabels(["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-                            "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
-        ax.set_xlim(0.5, 12.5)  # Extend x-axis slightly to prevent cutoff
-
-    # Show plot
-    st.pyplot(fig)
+    st.pyplot(births_figure(births_df, movie_color, time_selection))
 
-elif page == "Movie Summarizer":
+def render_movie_summarizer(processor):
+    """Random movie with its database genres and the LLM's classification."""
     st.title("Shuffle: Random Movie Classification")
 
     if st.button("Shuffle"):
@@ -207,16 +276,9 @@ elif page == "Movie Summarizer":
             height=70
         )
 
-        # 4) Classify the summary via your LLM
-        llm_genres = processor.classify_genres_with_llm(movie_info.summary)
-
-        # 5) Show the classification result in the third text box
+        # 4) Classify the summary via your LLM, showing the genres while they are generated
         st.subheader("LLM Classification")
-        st.text_area(
-            label="LLM-decided Genres",
-            value=llm_genres,
-            height=70
-        )
+        llm_genres = st.write_stream(processor.classify_genres_with_llm(movie_info.summary, stream=True))
 
         # Store the genres for evaluation
         st.session_state["db_genres"] = movie_info.genres
@@ -238,12 +300,35 @@ elif page == "Movie Summarizer":
     else:
         st.write("Click the **Shuffle** button to pick a random movie and see its genres!")
 
-elif page == "Become the main character":
+    # Classify ten random movies with two LLM requests instead of one per movie; five full
+    # plots per request keeps each prompt well inside the model's context window
+    if st.button("Shuffle 10"):
+        movies = [processor.get_random_movie() for _ in range(10)]
+        llm_genres = processor.classify_many([movie.summary for movie in movies], batch_size=5)
+        st.table([
+            {"Title": movie.title, "Genres (From Database)": movie.genres, "LLM Classification": genres}
+            for movie, genres in zip(movies, llm_genres)
+        ])
+
+def openai_client(api_key):
+    """
+    OpenAI client for api_key, kept in this browser session's state so repeated requests
+    reuse its connections. The shared processor never holds a user's key or client.
+    """
+    key_hash = hashlib.sha256(api_key.strip().encode()).hexdigest()
+    if st.session_state.get("openai_key_hash") != key_hash:
+        st.session_state.openai_client = OpenAI(api_key=api_key.strip())
+        st.session_state.openai_key_hash = key_hash
+    return st.session_state.openai_client
+
+
+def render_main_character(processor):
+    """Personalized plot of a random movie starring the user."""
     st.title("Become the Main Character")
     st.write("Enter your name and an OpenAI API key to generate a personalized movie plot where you're the star!")
     
     # Input field for API key (password field for security)
-    api_key = st.text_input("Enter your OpenAI API key", type="password", help="Your API key will not be stored")
+    api_key = st.text_input("Enter your OpenAI API key", type="password", help="Your API key is kept only for this browser session")
     
     # Input field for name
     name = st.text_input("Enter your name", help="This name will be used as the main character in a random movie plot")
@@ -257,7 +342,7 @@ elif page == "Become the main character":
             with st.spinner("Creating your personalized movie plot..."):
                 try:
                     # Call the personalize_movie_plot function
-                    personalized_plot = processor.personalize_movie_plot(name, api_key)
+                    personalized_plot = processor.personalize_movie_plot(name, api_key, openai_client(api_key))
                     
                     # Display the result
                     st.subheader("Your Personalized Movie Plot")
@@ -275,6 +360,19 @@ elif page == "Become the main character":
     st.info("""
     **Note**: 
     - This feature requires a valid OpenAI API key
-    - Your API key is used only for this request and is not stored
+    - Your API key is kept only for this browser session and is never saved
     - You may be charged by OpenAI for the API usage
-    """)
\ No newline at end of file
+    """)
+
+
+# Each page is rendered by its own function, so a rerun only executes the selected page
+PAGES = {
+    "Main Page": render_main_page,
+    "Chronological Info": render_chronological_info,
+    "Movie Summarizer": render_movie_summarizer,
+    "Become the main character": render_main_character,
+}
+
+# Navigation Sidebar
+page = st.radio("Go to", list(PAGES), horizontal=True)
+PAGES[page](processor)